@@ -6,3 +6,7 @@ class NoEnvVarsError(Exception):
 
 class RequestToApiError(Exception):
     pass
+
+
+class TemporaryApiError(RequestToApiError):
+    pass
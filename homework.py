@@ -7,9 +7,11 @@ from logging import Formatter, StreamHandler
 
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
 from telebot import apihelper, TeleBot
+from urllib3.util.retry import Retry
 
-from exceptions import NoEnvVarsError, RequestToApiError
+from exceptions import NoEnvVarsError, RequestToApiError, TemporaryApiError
 
 load_dotenv()
 
@@ -19,8 +21,39 @@ TELEGRAM_TOKEN = os.getenv('TELEGRAM_TOKEN')
 TELEGRAM_CHAT_ID = os.getenv('TELEGRAM_CHAT_ID')
 
 RETRY_PERIOD = 600
+TEMPORARY_ERRORS_LIMIT = 3
+MAX_MESSAGE_LENGTH = 4096
+MESSAGE_SEPARATOR = '\n\n'
 ENDPOINT = 'https://practicum.yandex.ru/api/user_api/homework_statuses/'
 HEADERS = {'Authorization': f'OAuth {PRACTICUM_TOKEN}'}
+REQUEST_TIMEOUT = (5, 30)
+RETRYABLE_STATUSES = frozenset((
+    HTTPStatus.TOO_MANY_REQUESTS,
+    HTTPStatus.INTERNAL_SERVER_ERROR,
+    HTTPStatus.BAD_GATEWAY,
+    HTTPStatus.SERVICE_UNAVAILABLE,
+    HTTPStatus.GATEWAY_TIMEOUT,
+))
+
+SESSION = requests.Session()
+SESSION.mount(
+    'https://',
+    HTTPAdapter(
+        pool_connections=1,
+        pool_maxsize=4,
+        max_retries=Retry(
+            total=3,
+            read=False,
+            backoff_factor=0.5,
+            status_forcelist=(
+                RETRYABLE_STATUSES - {HTTPStatus.TOO_MANY_REQUESTS}
+            ),
+            allowed_methods=frozenset(('GET',)),
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+    )
+)
 
 
 HOMEWORK_VERDICTS = {
@@ -44,33 +77,34 @@ logger.addHandler(handler)
 
 def check_tokens():
     """Проверка доступности переменных окружения."""
-    source = ('PRACTICUM_TOKEN', 'TELEGRAM_TOKEN', 'TELEGRAM_CHAT_ID')
-    undefined_vars = ()
-    for token in source:
-        if not globals().get(token):
-            undefined_vars += (token,)
+    source = (
+        ('PRACTICUM_TOKEN', PRACTICUM_TOKEN),
+        ('TELEGRAM_TOKEN', TELEGRAM_TOKEN),
+        ('TELEGRAM_CHAT_ID', TELEGRAM_CHAT_ID),
+    )
+    undefined_vars = tuple(name for name, value in source if not value)
     if undefined_vars:
         logger.critical(
-            'Отсутствуют обязательные переменные окружения: '
-            f'{str(undefined_vars)[1:-1]}. '
-            'Программа принудительно остановлена.'
+            'Отсутствуют обязательные переменные окружения: %s. '
+            'Программа принудительно остановлена.',
+            str(undefined_vars)[1:-1]
         )
         raise NoEnvVarsError
 
 
 def send_message(bot, message):
-    """Отправка сообщения в Telegram-чат."""
-    logger.debug(
-        f'Запуск процесса отправки сообщения "{message}".'
-    )
+    """
+    Отправка сообщения в Telegram-чат.
+    Возвращает True, если сообщение отправлено.
+    """
+    logger.debug('Запуск процесса отправки сообщения "%s".', message)
     try:
         bot.send_message(chat_id=TELEGRAM_CHAT_ID, text=message)
     except (apihelper.ApiException, requests.RequestException):
-        logger.exception(
-            f'Не удалось отправить сообщение "{message}".'
-        )
-    else:
-        logger.debug(f'Бот отправил сообщение "{message}".')
+        logger.exception('Не удалось отправить сообщение "%s".', message)
+        return False
+    logger.debug('Бот отправил сообщение "%s".', message)
+    return True
 
 
 def get_api_answer(timestamp):
@@ -81,13 +115,21 @@ def get_api_answer(timestamp):
     params = {'from_date': timestamp}
     logger.debug(
         'Запуск процесса отправки запроса к эндпоинту '
-        f'{ENDPOINT}. Параметры запроса: {params}.'
+        '%s. Параметры запроса: %s.',
+        ENDPOINT, params
     )
     try:
-        response = requests.get(
+        response = SESSION.get(
             ENDPOINT,
             headers=HEADERS,
-            params=params
+            params=params,
+            timeout=REQUEST_TIMEOUT
+        )
+    except requests.Timeout:
+        raise ConnectionError(
+            'Превышено время ожидания ответа от эндпоинта '
+            f'{ENDPOINT}. Параметры запроса: {params}. '
+            f'Таймаут (подключение, чтение): {REQUEST_TIMEOUT}.'
         )
     except requests.RequestException:
         raise ConnectionError(
@@ -96,14 +138,20 @@ def get_api_answer(timestamp):
         )
     else:
         if response.status_code != HTTPStatus.OK:
-            raise RequestToApiError(
+            error = (
+                TemporaryApiError
+                if response.status_code in RETRYABLE_STATUSES
+                else RequestToApiError
+            )
+            raise error(
                 f'Ошибка запроса к эндпоинту {ENDPOINT}. '
                 f'Причина: {response.reason}. '
                 f'Код ответа API: {response.status_code}.'
             )
         logger.debug(
             'Успешное завершение отправки запроса к эндпоинту '
-            f'{ENDPOINT}. Параметры запроса: {params}.'
+            '%s. Параметры запроса: %s.',
+            ENDPOINT, params
         )
         return response.json()
 
@@ -136,19 +184,18 @@ def parse_status(homework):
     В случае успеха возвращает подготовленную для отправки в Telegram строку.
     """
     logger.debug('Запуск проверки статуса домашней работы.')
-    homework_name = homework.get('homework_name')
-    homework_status = homework.get('status')
-
-    if 'homework_name' not in homework:
-        raise KeyError('В ответе API нет ключа "homework_name".')
-    elif 'status' not in homework:
-        raise KeyError('В ответе API нет ключа "status".')
-    elif homework_status not in HOMEWORK_VERDICTS:
+    try:
+        homework_name = homework['homework_name']
+        homework_status = homework['status']
+    except KeyError as error:
+        raise KeyError(f'В ответе API нет ключа "{error.args[0]}".') from None
+
+    verdict = HOMEWORK_VERDICTS.get(homework_status)
+    if verdict is None:
         raise ValueError(
             'В ответе API неожиданный статус домашней работы: '
             f'{homework_status}.'
         )
-    verdict = HOMEWORK_VERDICTS[homework_status]
     logger.debug(
         'Успешное завершение проверки статуса домашней работы.'
     )
@@ -158,6 +205,88 @@ def parse_status(homework):
     )
 
 
+def pack_messages(messages):
+    """
+    Группировка сообщений в минимальное число сообщений для Telegram.
+    Длина сообщений группы, объединённых через MESSAGE_SEPARATOR,
+    не превышает MAX_MESSAGE_LENGTH.
+    """
+    groups = []
+    length = 0
+    for message in messages:
+        if groups and (
+            length + len(MESSAGE_SEPARATOR) + len(message)
+            <= MAX_MESSAGE_LENGTH
+        ):
+            groups[-1].append(message)
+            length += len(MESSAGE_SEPARATOR) + len(message)
+        else:
+            groups.append([message])
+            length = len(message)
+    return groups
+
+
+def send_messages(bot, messages):
+    """
+    Отправка сообщений в Telegram-чат минимальным числом сообщений.
+    Возвращает список успешно отправленных сообщений.
+    """
+    sent = []
+    for group in pack_messages(messages):
+        if send_message(bot, MESSAGE_SEPARATOR.join(group)):
+            sent.extend(group)
+    return sent
+
+
+def get_new_messages(homeworks, last_sent):
+    """
+    Подготовка сообщений об изменившихся статусах домашних работ.
+    Возвращает словарь {название работы: сообщение}. Ошибка разбора
+    одной работы не прерывает обработку остальных: вместо статуса
+    в словарь попадает сообщение об ошибке с самим текстом в качестве ключа.
+    """
+    messages = {}
+    for homework in homeworks:
+        try:
+            message = parse_status(homework)
+            key = homework['homework_name']
+        except (KeyError, TypeError, ValueError) as error:
+            message = f'Сбой в работе программы: {error}'
+            key = message
+            logger.error(message)
+        if message != last_sent.get(key):
+            messages[key] = message
+    return messages
+
+
+def deliver_messages(bot, messages, last_sent):
+    """
+    Отправка сообщений о статусах и учёт отправленных в last_sent.
+    Возвращает словарь неотправленных сообщений для повторной отправки.
+    """
+    sent = set(send_messages(bot, messages.values()))
+    unsent = {}
+    for homework_name, message in messages.items():
+        if message in sent:
+            last_sent[homework_name] = message
+        else:
+            unsent[homework_name] = message
+    return unsent
+
+
+def report_error(bot, error, last_message):
+    """
+    Логирование ошибки и отправка сообщения о ней в Telegram-чат.
+    Сообщение не отправляется повторно, если совпадает с last_message.
+    Возвращает текст сообщения об ошибке.
+    """
+    message = f'Сбой в работе программы: {error}'
+    logger.error(message)
+    if message != last_message:
+        send_message(bot, message)
+    return message
+
+
 def main():
     """Основная логика работы бота."""
     check_tokens()
@@ -166,27 +295,47 @@ def main():
     timestamp = int(time.time())
 
     current_error_message = ''
+    temporary_errors = 0
+    last_sent = {}
+    unsent = {}
 
     while True:
         try:
             response = get_api_answer(timestamp)
+            temporary_errors = 0
             check_response(response)
 
             if response['homeworks']:
-                message = parse_status(response['homeworks'][0])
-                send_message(bot, message)
+                messages = get_new_messages(response['homeworks'], last_sent)
+                if not messages:
+                    logger.debug(
+                        'Статусы домашних работ не изменились, '
+                        'повторные сообщения не отправлены.'
+                    )
                 current_error_message = ''
             else:
+                messages = {}
                 logger.debug(
                     'Новые статусы домашних работ отсутствуют.'
                 )
-            timestamp = response.get('current_date', int(time.time()))
+            unsent = deliver_messages(bot, {**unsent, **messages}, last_sent)
+            timestamp = response.get('current_date') or int(time.time())
+        except TemporaryApiError as error:
+            temporary_errors += 1
+            if temporary_errors < TEMPORARY_ERRORS_LIMIT:
+                logger.warning(
+                    'Временная ошибка API: %s '
+                    'Повторный запрос через %s с.',
+                    error, RETRY_PERIOD
+                )
+            else:
+                current_error_message = report_error(
+                    bot, error, current_error_message
+                )
         except Exception as error:
-            message = f'Сбой в работе программы: {error}'
-            logger.error(message)
-            if current_error_message != message:
-                send_message(bot, message)
-            current_error_message = message
+            current_error_message = report_error(
+                bot, error, current_error_message
+            )
         finally:
             time.sleep(RETRY_PERIOD)
 
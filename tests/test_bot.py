@@ -2,8 +2,12 @@ import inspect
 import logging
 import platform
 import re
+import socket
+import threading
 import time
+from contextlib import contextmanager
 from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
 
 import pytest
 import requests
@@ -36,6 +40,72 @@ def get_mock_telegram_bot(monkeypatch, random_message):
     return telebot.TeleBot(token='')
 
 
+def get_sleep_breaking_after(iterations):
+    """Stop `main()` loop after the given number of iterations."""
+    calls = []
+
+    def sleep_to_interrupt(secs):
+        calls.append(secs)
+        if len(calls) >= iterations:
+            raise check_utils.BreakInfiniteLoop('break')
+
+    return sleep_to_interrupt
+
+
+def get_mock_sent_messages(monkeypatch, homework_module):
+    """Replace `send_message` and collect the messages passed to it."""
+    sent_messages = []
+
+    def mock_send_message(bot, message=''):
+        sent_messages.append(message)
+        return True
+
+    monkeypatch.setattr(homework_module, 'send_message', mock_send_message)
+    return sent_messages
+
+
+@contextmanager
+def serve_api_answers(monkeypatch, homework_module, answers):
+    """
+    Serve `(http_status, headers)` answers to `get_api_answer` from a local
+    server through the session's HTTPS adapter; yield the received paths.
+    """
+    received = []
+
+    class AnswerHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            received.append(self.path)
+            http_status, headers = answers.pop(0)
+            body = b'{"homeworks": [], "current_date": 0}'
+            self.send_response(http_status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), AnswerHandler)
+    threading.Thread(
+        target=server.serve_forever, kwargs={'poll_interval': 0.01},
+        daemon=True
+    ).start()
+    host, port = server.server_address
+    monkeypatch.setattr(homework_module, 'ENDPOINT', f'http://{host}:{port}/')
+    monkeypatch.setitem(
+        homework_module.SESSION.adapters,
+        'http://',
+        homework_module.SESSION.get_adapter('https://')
+    )
+    try:
+        yield received
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
 class TestHomework:
     HOMEWORK_VERDICTS = {
         'approved': 'Работа проверена: ревьюеру всё понравилось. Ура!',
@@ -203,7 +273,9 @@ class TestHomework:
                     'Проверьте, что в параметре `from_date` передано число.'
                 )
 
-        monkeypatch.setattr(requests, 'get', check_request_call)
+        monkeypatch.setattr(
+            homework_module.SESSION, 'get', check_request_call
+        )
         try:
             homework_module.get_api_answer(current_timestamp)
         except AssertionError:
@@ -228,7 +300,9 @@ class TestHomework:
                 current_timestamp=current_timestamp, **kwargs
             )
 
-        monkeypatch.setattr(requests, 'get', mock_response_get)
+        monkeypatch.setattr(
+            homework_module.SESSION, 'get', mock_response_get
+        )
 
         result = homework_module.get_api_answer(current_timestamp)
         assert isinstance(result, dict), (
@@ -246,7 +320,7 @@ class TestHomework:
             self.HOMEWORK_FUNC_WITH_PARAMS_QTY[func_name]
         )
 
-        monkeypatch.setattr(requests, 'get', response)
+        monkeypatch.setattr(homework_module.SESSION, 'get', response)
         try:
             homework_module.get_api_answer(current_timestamp)
         except Exception:
@@ -257,6 +331,172 @@ class TestHomework:
                 'ситуация, когда API домашки возвращает код, отличный от 200.'
             )
 
+    def test_get_api_answer_with_temporary_status(
+            self, monkeypatch, current_timestamp, homework_module
+    ):
+        func_name = 'get_api_answer'
+        monkeypatch.setattr(
+            homework_module.SESSION,
+            'get',
+            create_mock_response_get_with_custom_status_and_data(
+                random_timestamp=1000198000,
+                http_status=HTTPStatus.SERVICE_UNAVAILABLE,
+                data={}
+            )
+        )
+        with pytest.raises(homework_module.TemporaryApiError):
+            homework_module.get_api_answer(current_timestamp)
+
+        monkeypatch.setattr(
+            homework_module.SESSION, 'get', self.NOT_OK_RESPONSES[401]
+        )
+        try:
+            homework_module.get_api_answer(current_timestamp)
+        except homework_module.TemporaryApiError:
+            raise AssertionError(
+                f'Убедитесь, что функция `{func_name}` не считает '
+                'временной ошибку авторизации.'
+            )
+        except homework_module.RequestToApiError:
+            pass
+
+    def test_main_does_not_send_temporary_api_error(
+            self, monkeypatch, random_timestamp, current_timestamp,
+            random_message, caplog, homework_module
+    ):
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module
+        )
+        monkeypatch.setattr(
+            homework_module.SESSION,
+            'get',
+            create_mock_response_get_with_custom_status_and_data(
+                random_timestamp=random_timestamp,
+                http_status=HTTPStatus.BAD_GATEWAY,
+                data={}
+            )
+        )
+        sent_messages = get_mock_sent_messages(monkeypatch, homework_module)
+        with check_utils.check_logging(caplog, level=logging.WARNING, message=(
+                'Убедитесь, что временная ошибка API домашки логируется '
+                'с уровнем `WARNING`.'
+        )):
+            try:
+                homework_module.main()
+            except check_utils.BreakInfiniteLoop:
+                pass
+        assert not sent_messages, (
+            'Убедитесь, что бот не отправляет в Telegram сообщение '
+            'о временной ошибке API домашки.'
+        )
+
+    def test_get_api_answer_with_read_timeout(
+            self, monkeypatch, current_timestamp, homework_module
+    ):
+        func_name = 'get_api_answer'
+        silent_server = socket.socket()
+        silent_server.bind(('127.0.0.1', 0))
+        silent_server.listen()
+        host, port = silent_server.getsockname()
+        monkeypatch.setattr(
+            homework_module, 'ENDPOINT', f'http://{host}:{port}/'
+        )
+        monkeypatch.setattr(homework_module, 'REQUEST_TIMEOUT', (1, 0.1))
+        monkeypatch.setitem(
+            homework_module.SESSION.adapters,
+            'http://',
+            homework_module.SESSION.get_adapter('https://')
+        )
+        try:
+            with pytest.raises(ConnectionError) as error:
+                homework_module.get_api_answer(current_timestamp)
+        finally:
+            silent_server.close()
+        assert 'Превышено время ожидания' in str(error.value), (
+            f'Убедитесь, что функция `{func_name}` сообщает о превышении '
+            'времени ожидания ответа API домашки.'
+        )
+
+    @pytest.mark.timeout(5, method='thread')
+    def test_get_api_answer_retries_server_error(
+            self, monkeypatch, current_timestamp, homework_module
+    ):
+        func_name = 'get_api_answer'
+        answers = [
+            (HTTPStatus.SERVICE_UNAVAILABLE, {'Retry-After': '3600'}),
+            (HTTPStatus.OK, {})
+        ]
+        with serve_api_answers(
+            monkeypatch, homework_module, answers
+        ) as received:
+            result = homework_module.get_api_answer(current_timestamp)
+        assert isinstance(result, dict), (
+            f'Убедитесь, что функция `{func_name}` повторяет запрос после '
+            'ответа `503 Service Unavailable`, не дожидаясь `Retry-After`.'
+        )
+        assert len(received) == 2, (
+            f'Убедитесь, что функция `{func_name}` повторяет запрос '
+            'один раз, если повторный запрос успешен.'
+        )
+
+    def test_get_api_answer_does_not_retry_rate_limit(
+            self, monkeypatch, current_timestamp, homework_module
+    ):
+        func_name = 'get_api_answer'
+        answers = [(HTTPStatus.TOO_MANY_REQUESTS, {'Retry-After': '3600'})]
+        with serve_api_answers(
+            monkeypatch, homework_module, answers
+        ) as received:
+            with pytest.raises(homework_module.TemporaryApiError):
+                homework_module.get_api_answer(current_timestamp)
+        assert len(received) == 1, (
+            f'Убедитесь, что функция `{func_name}` не повторяет запрос '
+            'сразу после ответа `429 Too Many Requests`.'
+        )
+
+    @pytest.mark.parametrize(
+        'interrupted, alerts_qty', ((False, 1), (True, 0))
+    )
+    def test_main_sends_repeated_temporary_api_error(
+            self, monkeypatch, random_timestamp, current_timestamp,
+            random_message, homework_module, interrupted, alerts_qty
+    ):
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module
+        )
+        limit = homework_module.TEMPORARY_ERRORS_LIMIT
+        statuses = [HTTPStatus.BAD_GATEWAY] * limit
+        if interrupted:
+            statuses.insert(limit - 1, HTTPStatus.OK)
+        polls = len(statuses)
+
+        def mock_response_get(*args, **kwargs):
+            return check_utils.MockResponseGET(
+                *args, random_timestamp=random_timestamp,
+                http_status=statuses.pop(0), **kwargs
+            )
+
+        sent_messages = get_mock_sent_messages(monkeypatch, homework_module)
+        monkeypatch.setattr(homework_module.SESSION, 'get', mock_response_get)
+        monkeypatch.setattr(time, 'sleep', get_sleep_breaking_after(polls))
+        try:
+            homework_module.main()
+        except check_utils.BreakInfiniteLoop:
+            pass
+        assert len(sent_messages) == alerts_qty, (
+            'Убедитесь, что бот отправляет в Telegram сообщение о '
+            'временной ошибке API домашки, только если она повторяется '
+            f'{limit} раз подряд.'
+        )
+
     def test_get_api_answer_with_request_exception(
             self, current_timestamp, monkeypatch, homework_module
     ):
@@ -270,7 +510,9 @@ class TestHomework:
         def mock_request_get_with_exception(*args, **kwargs):
             raise requests.RequestException('Something wrong')
 
-        monkeypatch.setattr(requests, 'get', mock_request_get_with_exception)
+        monkeypatch.setattr(
+            homework_module.SESSION, 'get', mock_request_get_with_exception
+        )
         try:
             homework_module.get_api_answer(current_timestamp)
         except requests.RequestException as e:
@@ -595,7 +837,7 @@ class TestHomework:
                 data=response_data
             ))
         monkeypatch.setattr(
-            requests,
+            homework_module.SESSION,
             'get',
             mock_response_get_with_new_status
         )
@@ -658,7 +900,7 @@ class TestHomework:
                     )
                 ]
                 assert log_record, (
-                    'Убедитесь, что бот использует функцию `requests.get()` '
+                    'Убедитесь, что бот использует метод `SESSION.get()` '
                     'для отправки запроса к API домашки.'
                 )
 
@@ -751,6 +993,202 @@ class TestHomework:
                     f'Вызов функции `main` завершился ошибкой: {e}'
                 ) from e
 
+    def test_main_does_not_resend_unchanged_status(
+            self, monkeypatch, random_timestamp, current_timestamp,
+            random_message, homework_module, data_with_new_hw_status
+    ):
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module,
+            response_data=data_with_new_hw_status
+        )
+        sent_messages = get_mock_sent_messages(monkeypatch, homework_module)
+        monkeypatch.setattr(time, 'sleep', get_sleep_breaking_after(2))
+        try:
+            homework_module.main()
+        except check_utils.BreakInfiniteLoop:
+            pass
+        assert len(sent_messages) == 1, (
+            'Убедитесь, что бот не отправляет повторно сообщение '
+            'о статусе домашней работы, который не изменился.'
+        )
+
+    def test_pack_messages(self, homework_module):
+        func_name = 'pack_messages'
+        check_utils.check_function(homework_module, func_name, 1)
+        max_length = homework_module.MAX_MESSAGE_LENGTH
+        separator = homework_module.MESSAGE_SEPARATOR
+
+        assert homework_module.pack_messages([]) == [], (
+            f'Убедитесь, что `{func_name}` возвращает пустой список, '
+            'если сообщений нет.'
+        )
+        assert homework_module.pack_messages(['first', 'second']) == [
+            ['first', 'second']
+        ], (
+            f'Убедитесь, что `{func_name}` объединяет короткие сообщения '
+            'в одно.'
+        )
+        messages = ['a' * (max_length // 2), 'b' * (max_length // 2), 'c']
+        groups = homework_module.pack_messages(messages)
+        assert all(
+            len(separator.join(group)) <= max_length for group in groups
+        ), (
+            f'Убедитесь, что `{func_name}` не превышает длину сообщения '
+            f'{max_length} символов.'
+        )
+        assert sum(groups, []) == messages, (
+            f'Убедитесь, что `{func_name}` не теряет и не переставляет '
+            'сообщения.'
+        )
+        assert len(groups) == 2, (
+            f'Убедитесь, что `{func_name}` использует минимальное '
+            'число сообщений.'
+        )
+
+    def test_main_resends_status_after_failed_send(
+            self, monkeypatch, random_timestamp, current_timestamp,
+            random_message, homework_module, data_with_new_hw_status
+    ):
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module
+        )
+        answers = [
+            data_with_new_hw_status,
+            {'homeworks': [], 'current_date': random_timestamp},
+            {'homeworks': [], 'current_date': random_timestamp}
+        ]
+
+        def mock_response_get(*args, **kwargs):
+            return check_utils.MockResponseGET(
+                *args, random_timestamp=random_timestamp,
+                data=answers.pop(0), **kwargs
+            )
+
+        sent_messages = []
+
+        def mock_send_message(bot, message=''):
+            sent_messages.append(message)
+            return len(sent_messages) > 1
+
+        monkeypatch.setattr(homework_module.SESSION, 'get', mock_response_get)
+        monkeypatch.setattr(homework_module, 'send_message', mock_send_message)
+        monkeypatch.setattr(time, 'sleep', get_sleep_breaking_after(3))
+        try:
+            homework_module.main()
+        except check_utils.BreakInfiniteLoop:
+            pass
+        assert len(sent_messages) == 2, (
+            'Убедитесь, что бот повторяет отправку статуса домашней '
+            'работы, если предыдущая отправка не удалась, и не отправляет '
+            'его снова после успешной отправки.'
+        )
+
+    def test_main_keeps_statuses_of_failed_batch(
+            self, monkeypatch, random_timestamp, current_timestamp,
+            random_message, homework_module
+    ):
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module
+        )
+        approved = {'homework_name': 'hw1.zip', 'status': 'approved'}
+        answers = [
+            {
+                'homeworks': [
+                    approved,
+                    {'homework_name': 'hw2.zip', 'status': 'unknown'}
+                ],
+                'current_date': random_timestamp
+            },
+            {
+                'homeworks': [
+                    approved,
+                    {'homework_name': 'hw2.zip', 'status': 'reviewing'}
+                ],
+                'current_date': random_timestamp
+            }
+        ]
+
+        def mock_response_get(*args, **kwargs):
+            return check_utils.MockResponseGET(
+                *args, random_timestamp=random_timestamp,
+                data=answers.pop(0), **kwargs
+            )
+
+        sent_messages = get_mock_sent_messages(monkeypatch, homework_module)
+        monkeypatch.setattr(homework_module.SESSION, 'get', mock_response_get)
+        monkeypatch.setattr(time, 'sleep', get_sleep_breaking_after(2))
+        try:
+            homework_module.main()
+        except check_utils.BreakInfiniteLoop:
+            pass
+        assert any(
+            self.HOMEWORK_VERDICTS['approved'] in message
+            for message in sent_messages
+        ), (
+            'Убедитесь, что статусы из ответа, обработка которого '
+            'завершилась ошибкой, отправляются при следующем запросе.'
+        )
+
+    def test_main_delivers_valid_statuses_despite_bad_homework(
+            self, monkeypatch, random_timestamp, current_timestamp,
+            random_message, homework_module
+    ):
+        self.mock_main(
+            monkeypatch,
+            random_message,
+            random_timestamp,
+            current_timestamp,
+            homework_module
+        )
+        answer = {
+            'homeworks': [
+                {'homework_name': 'hw1.zip', 'status': 'approved'},
+                {'homework_name': 'hw2.zip', 'status': 'unknown'}
+            ],
+            'current_date': random_timestamp
+        }
+        requested_dates = []
+
+        def mock_response_get(*args, **kwargs):
+            requested_dates.append(kwargs['params']['from_date'])
+            return check_utils.MockResponseGET(
+                *args, random_timestamp=random_timestamp, data=answer,
+                **kwargs
+            )
+
+        sent_messages = get_mock_sent_messages(monkeypatch, homework_module)
+        monkeypatch.setattr(homework_module.SESSION, 'get', mock_response_get)
+        monkeypatch.setattr(time, 'sleep', get_sleep_breaking_after(3))
+        try:
+            homework_module.main()
+        except check_utils.BreakInfiniteLoop:
+            pass
+        delivered = homework_module.MESSAGE_SEPARATOR.join(sent_messages)
+        assert delivered.count(self.HOMEWORK_VERDICTS['approved']) == 1, (
+            'Убедитесь, что ошибка в данных одной домашней работы '
+            'не мешает отправить статусы остальных работ.'
+        )
+        assert delivered.count('unknown') == 1, (
+            'Убедитесь, что об ошибке в данных домашней работы бот '
+            'сообщает один раз.'
+        )
+        assert requested_dates[1:] == [random_timestamp] * 2, (
+            'Убедитесь, что после ответа с ошибкой в данных домашней '
+            'работы бот запрашивает статусы с новой даты `current_date`.'
+        )
+
     def test_main_log_response_whithout_homeworks(
             self, monkeypatch, random_timestamp, current_timestamp,
             random_message, caplog, homework_module